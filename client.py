@@ -7,14 +7,15 @@ import sys
 import socket
 import struct
 import time
-import calendar
 import binascii
-import re
-import copy
-import pycrc
+import hashlib
+import concurrent.futures
 
 import flexnet.file
 
+# Bound once so the per-message paths skip the module attribute lookup
+_gmtime = time.gmtime
+
 HEADERLEN = 20
 TYPE_REQLIC1 = 0x004e # response: license status (vendor)
 TYPE_REQ     = 0x0108 # request: command (manager)
@@ -38,9 +39,116 @@ PREFIXES = [0x2f, 0x4c, 0x4e]
 # Protocol changed around version 11.10
 VER_NEW = (11, 10)
 
+# Recently fetched license files, keyed by (server, port).  License files
+# change rarely, so repeat queries within the TTL skip the fetch and parse.
+_LICENSE_FILE_CACHE = {}
+_LICENSE_FILE_TTL = 300 # seconds
+
+# Parsed license files keyed by a digest of their text, so a file whose
+# content hasn't changed is never parsed twice, even across managers or
+# after the fetch cache above expires.
+_PARSE_CACHE = {}
+_PARSE_CACHE_MAX = 32
+
+# Idle TCP connections kept for reuse, keyed by (server, port).  Saves a
+# handshake when clients repeatedly close and reconnect to the same daemon.
+_POOL = {}
+_POOL_MAX = 4 # idle sockets kept per (server, port)
+
+# Compiled once so the hot pack/unpack paths skip format-string parsing
+_HDR   = struct.Struct('!HHL') # request length, type, timestamp
+_CHK   = struct.Struct('!BH')  # check byte, CRC
+_B     = struct.Struct('B')
+_BB    = struct.Struct('BB')
+_B4    = struct.Struct('4B')
+_U16BE = struct.Struct('!H')
+_U32BE = struct.Struct('!L')
+_U64BE = struct.Struct('!Q')
+# Whole hello body in one pack: each 's' width includes the null
+# separator that used to be joined in after the ljust padding
+_HELLO = struct.Struct('>21s33s11s33s13s11s13sBB6s')
+
 CRCWIDTH = 14
 CRCPOLY = 0x2e97
-crc = pycrc.Crc(width=CRCWIDTH, poly=CRCPOLY, reflect_in=True, xor_in=0, reflect_out=True, xor_out=0)
+
+def _crc_table_build(width, poly):
+    """Build the 256-entry lookup table for a reflected CRC at import time."""
+    # Mirror the polynomial over its width so the register can shift right
+    # (least-significant-bit first), matching reflect_in/reflect_out.
+    poly_r = 0
+    for i in range(width):
+        if poly & (1 << i):
+            poly_r |= 1 << (width - 1 - i)
+    table = []
+    for byte in range(256):
+        reg = byte
+        for _ in range(8):
+            if reg & 1:
+                reg = (reg >> 1) ^ poly_r
+            else:
+                reg >>= 1
+        table.append(reg)
+    return table
+
+CRC_TABLE = _crc_table_build(CRCWIDTH, CRCPOLY)
+
+def _compute_check_py(data):
+    """CRC-14 and header check byte in one pass (pure-Python fallback)."""
+    table = CRC_TABLE
+    reg = 0
+    for b in data:
+        reg = table[(reg ^ b) & 0xff] ^ (reg >> 8)
+    # check byte is a modular sum of the CRC bytes and the header data
+    cb = ((reg >> 8) + (reg & 0xff) + sum(data[:16]) + 47) % 256
+    return reg, cb
+
+# Prefer the native implementation from the optional C extension, then a
+# Numba-jitted loop if that's available, then the pure-Python fallback.
+try:
+    from flexnet._crc import compute_check as _compute_check
+except ImportError:
+    try:
+        import numba
+        import numpy
+
+        _CRC_TABLE_NP = numpy.asarray(CRC_TABLE, dtype=numpy.uint16)
+
+        @numba.njit(cache=True)
+        def _compute_check_jit(buf, table):
+            reg = 0
+            for i in range(buf.shape[0]):
+                reg = table[(reg ^ buf[i]) & 0xff] ^ (reg >> 8)
+            cb_sum = 0
+            for i in range(min(buf.shape[0], 16)):
+                cb_sum += buf[i]
+            cb = ((reg >> 8) + (reg & 0xff) + cb_sum + 47) % 256
+            return reg, cb
+
+        def _compute_check(data):
+            buf = numpy.frombuffer(bytes(data), dtype=numpy.uint8)
+            return _compute_check_jit(buf, _CRC_TABLE_NP)
+    except ImportError:
+        _compute_check = _compute_check_py
+
+def _flexnet_parse_cached(text):
+    """Parse license file text, memoized on a hash of the content"""
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    parsed = _PARSE_CACHE.pop(key, None)
+    if parsed is None:
+        parsed = flexnet.file.flexnet_parse(text)
+        while len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+            # Insertion order doubles as recency; drop the oldest
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+    _PARSE_CACHE[key] = parsed
+    return parsed
+
+def _split_cstrings(data):
+    """Split a null-delimited payload into its non-empty fields, decoded
+
+    One linear scan, replacing the strip + split + filter combinations the
+    response parser used to run over every payload.
+    """
+    return [f.decode() for f in bytes(data).split(b'\x00') if f]
 
 class _Client(object):
     """Base class for both server types"""
@@ -64,19 +172,60 @@ class _Client(object):
         self.arch    = 'x64_lsb' # OS/arch ("64-bit Linux Standard Base"?)
         self.version = (11,11) # "this" lmstat version
 
+        self._hello_cache = {} # packed hello request per vendor name
+
         self.connect()
 
     # Lower-level public methods for specific connection and request types
 
     def connect(self):
-        """Open TCP connection to self.server at self.port"""
+        """Open TCP connection to self.server at self.port
+
+        Reuses an idle pooled connection to the same (server, port) if one
+        is available; see close().
+        """
+        idle = _POOL.get((self.server, self.port))
+        while idle:
+            try:
+                s = idle.pop()
+            except IndexError: # another thread drained the pool
+                break
+            try:
+                # An idle connection should have nothing to read; data or
+                # EOF here means the server gave up on it.  The socket
+                # still carries its i/o timeout, under which recv waits
+                # for readability, so drop to non-blocking for the peek.
+                s.settimeout(0)
+                s.recv(1, socket.MSG_PEEK)
+            except (BlockingIOError, InterruptedError):
+                # Nothing pending, so the connection is alive: take it
+                s.settimeout(10)
+                self.s = s
+                self._rxbuf = bytearray()
+                return
+            except socket.error:
+                pass
+            s.close()
         self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.s.settimeout(10)
+        # Room for a whole license-file response in the kernel buffer;
+        # set before connect so the window scale reflects it
+        self.s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 262144)
         self.s.connect((self.server, self.port))
+        # Small request/response round-trips are exactly what Nagle's
+        # algorithm penalizes, so send each request immediately
+        self.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Keep long-lived vendor sessions from dying silently
+        self.s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._rxbuf = bytearray() # received but not yet consumed bytes
 
     def close(self):
-        """Close TCP connection"""
-        self.s.close()
+        """Close TCP connection, pooling it for reuse when possible"""
+        idle = _POOL.setdefault((self.server, self.port), [])
+        if len(idle) < _POOL_MAX and not self._rxbuf:
+            idle.append(self.s)
+        else:
+            self.s.close()
 
     def hello(self):
         """Send introductory message to license manager server"""
@@ -87,24 +236,31 @@ class _Client(object):
     # Implementation details
 
     def _hello_pack(self):
-        data = ( self.user.ljust(20,   '\x00'),
-                 self.host.ljust(32,   '\x00'),
-                 self.vendor.ljust(10, '\x00'),
-                 self.tty.ljust(32,    '\x00'),
-                 '\x84'.ljust(12,      '\x00'), # ???
-                 self.pid.ljust(10,    '\x00'),
-                 self.arch.ljust(12,   '\x00') )
-
-        ver = struct.pack("BB", *self.version)
-        num = '78\x0014\x00' # ???
-        req = ''.join([d+'\x00' for d in data]) + ver + num
-
-        cb = sum(map(ord, req[:len(req)-2]))%256
-        prefix = struct.pack('4B', 0x68, # ???
-                                   cb,
-                                   0x31, # ???
-                                   0x33) # ???
+        # Everything in the hello request except the vendor is fixed for
+        # the lifetime of the client, so the packed bytes are cached per
+        # vendor name; hello() is re-sent often enough to make it count.
+        req = self._hello_cache.get(self.vendor)
+        if req is not None:
+            return req
+
+        req = _HELLO.pack(self.user.encode(),
+                          self.host.encode(),
+                          self.vendor.encode(),
+                          self.tty.encode(),
+                          b'\x84', # ???
+                          self.pid.encode(),
+                          self.arch.encode(),
+                          self.version[0],
+                          self.version[1],
+                          b'78\x0014\x00') # ???
+
+        cb = sum(memoryview(req)[:-2]) % 256
+        prefix = _B4.pack(0x68, # ???
+                          cb,
+                          0x31, # ???
+                          0x33) # ???
         req = prefix + req
+        self._hello_cache[self.vendor] = req
         return req
 
     # TODO many of these response types only occur for certain requests.
@@ -118,17 +274,17 @@ class _Client(object):
         # Old version, chunked text data
 
         if header["prefix"] == 0x4c:
-            resp_text = ""
-            for i in range(0, len(response), 147):
-                resp_text += response[i+13:i+147]
-            resp_text = resp_text.strip('\x00').split('\x00')
-            message["text"] = resp_text
+            # Strip the 13-byte framing off every chunk, then join once;
+            # growing a string with += here was quadratic in file size
+            chunks = [response[i+13:i+147] for i in range(0, len(response), 147)]
+            resp_text = b''.join(chunks).strip(b'\x00').split(b'\x00')
+            message["text"] = [t.decode() for t in resp_text]
 
         # Otherwise newer version
 
         # response to a hello() request
         elif header.get("type") == TYPE_HELLO:
-            txt = response[header["len"]:].strip('\x00').split('\x00')
+            txt = _split_cstrings(response[header["len"]:])
             message["hostname"]        = txt[0]
             message["daemon"]          = txt[1]
             message["server_version"]  = header["srv_ver"]
@@ -143,17 +299,16 @@ class _Client(object):
         # hello() with a vendor specified.
         elif header.get("type") == TYPE_STUBR:
             payload = response[header["len"]:]
-            hostname, remainder = payload.split('\x00', 1)
-            message["vendor_hostname"] = hostname
-            message["vendor_port"], = struct.unpack('!L', remainder[:4])
+            hostname, remainder = payload.split(b'\x00', 1)
+            message["vendor_hostname"] = hostname.decode()
+            message["vendor_port"] = _U32BE.unpack_from(remainder, 0)[0]
 
         # Response to request for license sets?
         elif header.get("type") == TYPE_STUB2:
             # The "text" is interspersed with runs of NULLs and 0x01 and 0x07.
             # No idea what that means.
-            txt = response[header["len"]:]
-            strip_binary = lambda x: x.strip('\x01\x07')
-            fields = filter(len, map(strip_binary, txt.split('\x00')))
+            txt = _split_cstrings(response[header["len"]:])
+            fields = [f for f in (x.strip('\x01\x07') for x in txt) if f]
             message["text"] = fields
 
         # Response to license status request.
@@ -161,48 +316,45 @@ class _Client(object):
             payload = response[header["len"]:]
             # mysterious 2-byte prefix, followed by ASCII integers for number
             # used, number in total, and a timestamp.
-            prefix    = struct.unpack('BB', payload[0:2])
-            fields = filter(len, payload[2:].split('\x00'))
+            prefix    = _BB.unpack_from(payload, 0)
+            fields = _split_cstrings(payload[2:])
             used      = fields[0]
             total     = fields[1]
             timestamp = fields[2]
             message["prefix"]    = prefix
             message["used"]      = int(used)
             message["total"]     = int(total)
-            message["timestamp"] = time.gmtime(int(timestamp))
+            message["timestamp"] = _gmtime(int(timestamp))
 
         # Response showing license usage following a license status request.
         # One response per group reservation/user chckout for that license.
         elif header.get("type") == TYPE_REQLIC2:
-            segments = response[header["len"]:].split('\x01',1)
+            segments = response[header["len"]:].split(b'\x01',1)
             # null-terminated strings
-            txtfields = segments[0].split('\x00')
+            txtfields = segments[0].split(b'\x00')
             # group reservations are handled separately.  They have an extra
             # 'G' at the beginning of the name field and zeros for the binary
             # segment.
-            if not sum(map(ord,segments[1])) and txtfields[0][0] == 'G':
-                message["group_reservation"] = txtfields[0][1:]
+            if not any(segments[1]) and txtfields[0][0:1] == b'G':
+                message["group_reservation"] = txtfields[0][1:].decode()
             else:
-                message["user"]    = txtfields[0]
-                message["host"]    = txtfields[1]
-                message["tty"]     = txtfields[2]
-                message["version"] = txtfields[3]
+                message["user"]    = txtfields[0].decode()
+                message["host"]    = txtfields[1].decode()
+                message["tty"]     = txtfields[2].decode()
+                message["version"] = txtfields[3].decode()
                 # remaining bytes of binary data
-                timestamp = segments[1][4:8]
-                number    = segments[1][8:16]
-                timeval, = struct.unpack('!L', timestamp)
-                message["time"] = time.gmtime(timeval)
-                message["number"], = struct.unpack('!Q', number)
+                timeval = _U32BE.unpack_from(segments[1], 4)[0]
+                message["time"] = _gmtime(timeval)
+                message["number"] = _U64BE.unpack_from(segments[1], 8)[0]
 
         else:
-            txt = response[header["len"]:].strip('\x00').split('\x00')
-            fields = filter(len, txt)
-            message["text"] = fields
+            message["text"] = _split_cstrings(response[header["len"]:])
 
         if self.verbose:
-            sys.stderr.write("Parsed Response:\n")
-            for key in message.keys():
-                sys.stderr.write("   %s: %s\n" % (key, str(message[key])))
+            write = sys.stderr.write
+            write("Parsed Response:\n")
+            for key, val in message.items():
+                write("   %s: %s\n" % (key, val))
         return message
 
     def _header_create(self, data, reqtype=TYPE_REQ):
@@ -215,96 +367,112 @@ class _Client(object):
         # 2 for \x01\x04 (what's this?)
         # a varying-length segment with the main data
         # ---
-        timestamp = calendar.timegm(time.gmtime()) # Current unix time in UTC
+        timestamp = int(time.time()) # Current unix time in UTC
         reqlen = len(data)+HEADERLEN
-        # The 18 bytes before prefix, checksum, CRC
-        header = struct.pack("!HHL",
-                reqlen,
-                reqtype,
-                timestamp)
-        header = header.ljust(16, '\x00')
-
-        return chr(0x2f) + self._checkbytes(header+data) + header
+        # Pack the whole request into one buffer so the header and data
+        # never need to be concatenated
+        req = bytearray(reqlen)
+        req[0] = 0x2f
+        _HDR.pack_into(req, 4, reqlen, reqtype, timestamp)
+        # bytes 10 through 19 stay null padding
+        req[HEADERLEN:] = data
+        req[1:4] = self._checkbytes(memoryview(req)[4:])
+        return bytes(req)
     
     def _checkbytes(self, data):
-        # CRC is packed in 2 bytes, big-endian
-        crc_val = crc.table_driven(map(ord, data))
-        crc_str = struct.pack("!H", crc_val)
-        # check byte is a modular sum of of the header data
-        cb = (sum(map(ord, crc_str + data[:16]))+47)%256
-        return chr(cb) + crc_str
+        # CRC and check byte in one pass over the raw bytes, natively if
+        # the C extension is built.
+        crc_val, cb = _compute_check(data)
+        # check byte, then CRC packed in 2 bytes, big-endian
+        return _CHK.pack(cb, crc_val)
 
     def _header_parse(self, data):
         header = {}
-        header["prefix"],   = struct.unpack('B', data[0])
+        header["prefix"]   = _B.unpack_from(data, 0)[0]
         if header["prefix"] == 0x4c:
             return header
         if header["prefix"] == 0x4e:
             header["len"] = 2
             return header
-        header["checksum"], = struct.unpack('B', data[1])
-        header["crc"],      = struct.unpack('!H', data[2:4])
-        header["msg_len"],  = struct.unpack('!H', data[4:6])
-        header["type"],     = struct.unpack('!H', data[6:8])
+        header["checksum"] = _B.unpack_from(data, 1)[0]
+        header["crc"]      = _U16BE.unpack_from(data, 2)[0]
+        header["msg_len"]  = _U16BE.unpack_from(data, 4)[0]
+        header["type"]     = _U16BE.unpack_from(data, 6)[0]
         header["len"] = HEADERLENS[header["type"]]
         if header["type"] == TYPE_HELLO:
-            header["token"],  = struct.unpack('!L', data[8:12])
-            header["srv_ver"] = struct.unpack('2B', data[20:22])
-            header["suffix"], = struct.unpack('!H', data[22:24])
+            header["token"]   = _U32BE.unpack_from(data, 8)[0]
+            header["srv_ver"] = _BB.unpack_from(data, 20)
+            header["suffix"]  = _U16BE.unpack_from(data, 22)[0]
         elif header["type"] == TYPE_RESP:
-            timeval, = struct.unpack('!L', data[8:12])
-            header["time"] = time.gmtime(timeval)
-            header["txt_len"], = struct.unpack('!H', data[22:24])
+            timeval = _U32BE.unpack_from(data, 8)[0]
+            header["time"] = _gmtime(timeval)
+            header["txt_len"] = _U16BE.unpack_from(data, 22)[0]
         elif header["type"] == TYPE_REQLIC2:
-            timeval, = struct.unpack('!L', data[8:12])
-            header["time"] = time.gmtime(timeval)
+            timeval = _U32BE.unpack_from(data, 8)[0]
+            header["time"] = _gmtime(timeval)
         self._header_validate(data, header)
         return header
 
     def _header_validate(self, data, header):
-        check = self._checkbytes(data[4:])
+        # A memoryview keeps the validation pass from copying the payload
+        check = self._checkbytes(memoryview(data)[4:])
         if check != data[1:4]:
-            check = binascii.hexlify(check)
-            actual = binascii.hexlify(data[1:4])
+            check = binascii.hexlify(check).decode()
+            actual = binascii.hexlify(data[1:4]).decode()
             raise ValueError("Header prefix expected to be 0x%s, but got 0x%s" % (check, actual))
 
     def _query(self, request=None):
         if request:
             if self.debug:
-                sys.stderr.write("Request: %s\n" % binascii.hexlify(request))
+                sys.stderr.write("Request: %s\n" % binascii.hexlify(request).decode())
             self.s.sendall(request)
-        response = self.s.recv(1)
-        prefix = ord(response[0])
+        buf = self._rxbuf
+        self._recv_at_least(1)
+        prefix = buf[0]
         if prefix not in PREFIXES:
             raise Exception("Unexpected response prefix %s" % hex(prefix))
         ### Older versions, data chunked in 147-byte segments
         if prefix == 0x4c:
-            response += self.s.recv(147-1)
-            length_remaining = self._length_remaining(response)
+            self._recv_at_least(147)
+            end = 147
+            length_remaining = self._length_remaining(memoryview(buf)[:147])
             while length_remaining > (147-13):
-                newbytes = self.s.recv(147)
-                while len(newbytes) < 147:
-                    newbytes += self.s.recv(147-len(newbytes))
-                response += newbytes
-                length_remaining = self._length_remaining(newbytes)
+                self._recv_at_least(end+147)
+                length_remaining = self._length_remaining(memoryview(buf)[end:end+147])
+                end += 147
         elif prefix == 0x4e:
-            response += self.s.recv(147-1)
+            self._recv_at_least(147)
+            end = 147
         ### Newer versions, length is given in header
         else:
-            while len(response) < 20:
-                response += self.s.recv(20-len(response))
-            len_total, = struct.unpack('!H', response[4:6])
-            torecv = len_total - len(response)
-            # Now get remaining data
-            while torecv>0:
-                response += self.s.recv(min(4096, torecv))
-                torecv = len_total - len(response)
+            self._recv_at_least(HEADERLEN)
+            end = _U16BE.unpack_from(buf, 4)[0]
+            self._recv_at_least(end)
+        # Peel this response off the front of the buffer; anything after
+        # it belongs to the next response on this connection
+        response = bytes(buf[:end])
+        del buf[:end]
         if self.debug:
-            sys.stderr.write("Response: %s\n" % binascii.hexlify(response))
+            sys.stderr.write("Response: %s\n" % binascii.hexlify(response).decode())
         return response
 
+    def _recv_at_least(self, n):
+        """Read from the socket until at least n bytes are buffered
+
+        Reads in large batches rather than chunk-sized pieces to keep the
+        syscall count down; whatever arrives beyond n stays buffered for
+        subsequent responses.
+        """
+        buf = self._rxbuf
+        while len(buf) < n:
+            data = self.s.recv(65536)
+            if not data:
+                raise Exception("Connection closed with %d of %d bytes read"
+                                % (len(buf), n))
+            buf.extend(data)
+
     def _length_remaining(self, data):
-            return int(data[2:13].split('\x00')[0])
+            return int(bytes(data[2:13]).split(b'\x00')[0])
 
 
 class ManagerClient(_Client):
@@ -368,8 +536,10 @@ class ManagerClient(_Client):
         self.server_params["server_version"]  = msg["server_version"]
         # For standalone managers that's all we need, but for redundant
         # managers it might be directing us to a different server entirely.
-        # Either way just re-connecting with the specified hostname should
-        # work.
+        # If it points back at the server we're already talking to, keep
+        # this session; otherwise re-connect with the specified hostname.
+        if msg["hostname"] == self.server:
+            return
         self.close()
         self.server = msg["hostname"]
         self.connect()
@@ -383,10 +553,22 @@ class ManagerClient(_Client):
         return license_file_path
 
     def query_server_license_file_contents(self):
-        """Query server for contents of license file text"""
-        msg = self.request()
-        self.server_params["license_file_text"] = msg["text"][0]
-        parsed_lic_file = flexnet.file.flexnet_parse(msg["text"][0])
+        """Query server for contents of license file text
+
+        Back-to-back queries against the same manager reuse the previous
+        fetch and parse for a few minutes rather than transferring and
+        re-parsing the whole file each time.
+        """
+        key = (self.server, self.port)
+        cached = _LICENSE_FILE_CACHE.get(key)
+        if cached and time.time() - cached[0] < _LICENSE_FILE_TTL:
+            text, parsed_lic_file = cached[1], cached[2]
+        else:
+            msg = self.request()
+            text = msg["text"][0]
+            parsed_lic_file = _flexnet_parse_cached(text)
+            _LICENSE_FILE_CACHE[key] = (time.time(), text, parsed_lic_file)
+        self.server_params["license_file_text"] = text
         self.server_params["licenses_in_file"] = parsed_lic_file["licenses"]
         return parsed_lic_file
 
@@ -403,8 +585,12 @@ class ManagerClient(_Client):
         # this is handled.
         return self.server_params["vendors"]
 
-    def query_vendor_details(self):
-        """Connect to each vendor daemon for full details"""
+    def query_vendor_details(self, skip_unused=False):
+        """Connect to each vendor daemon for full details
+
+        With skip_unused, idle licenses only get their status counts
+        recorded; see query_vendor_license_status_batch.
+        """
         p = self.server_params
         vendors = {}
         # Gather vendor hostnames and ports
@@ -414,34 +600,46 @@ class ManagerClient(_Client):
             vendors[vendor_name] = {}
             vendors[vendor_name]["hostname"] = msg["vendor_hostname"]
             vendors[vendor_name]["port"] = msg["vendor_port"]
-        # Connect to each vendor
-        for vendor_name in vendors.keys():
-            v = vendors[vendor_name]
-            client = VendorClient(v["hostname"], v["port"])
-            self.vendors.append(client)
-            client.vendor = vendor_name
-            client.hello()
-            client.query_vendor_features()
-            # These are licenses reported directly by the vendor daemon,
-            # and not mentioned in the license file text from the license
-            # manager daemon.
-            # TODO make this work for oldproto
-            if not self.oldproto:
-                client.query_vendor_licenses()
-            # Alternatively, some licenses may only be listed in the license
-            # file text returned by the license manager.  So, also query
-            # licenses from the file that match this vendor.
-            license_file_entries = filter(lambda lic: lic["vendor"] == vendor_name, p["licenses_in_file"])
-            client.licenses = [flexnet.licenses.License(data) for data in license_file_entries]
-            # Now that all licenses for this vendor have been accounted for,
-            # actually request license status/usage from the vendor daemon
-            for lic_set in client.license_sets:
-                for lic in lic_set.licenses:
-                    client.query_vendor_license_status(lic)
-            for lic in client.licenses:
-                client.query_vendor_license_status(lic)
+        # Connect to each vendor.  Every vendor daemon gets its own
+        # connection, so the queries are independent; run them in a small
+        # thread pool to overlap the per-vendor round-trips.
+        if vendors:
+            workers = min(8, len(vendors))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self._query_one_vendor, vendor_name, v,
+                                       skip_unused)
+                           for vendor_name, v in vendors.items()]
+                for future in futures:
+                    self.vendors.append(future.result())
         return vendors
 
+    def _query_one_vendor(self, vendor_name, v, skip_unused=False):
+        """Connect to a single vendor daemon and query its full details"""
+        client = VendorClient(v["hostname"], v["port"])
+        client.vendor = vendor_name
+        client.hello()
+        client.query_vendor_features()
+        # These are licenses reported directly by the vendor daemon,
+        # and not mentioned in the license file text from the license
+        # manager daemon.
+        # TODO make this work for oldproto
+        if not self.oldproto:
+            client.query_vendor_licenses()
+        # Alternatively, some licenses may only be listed in the license
+        # file text returned by the license manager.  So, also query
+        # licenses from the file that match this vendor.
+        license_file_entries = [lic for lic in self.server_params["licenses_in_file"]
+                                if lic["vendor"] == vendor_name]
+        client.licenses = [flexnet.licenses.License(data) for data in license_file_entries]
+        # Now that all licenses for this vendor have been accounted for,
+        # actually request license status/usage from the vendor daemon
+        for lic_set in client.license_sets:
+            client.query_vendor_license_status_batch(lic_set.licenses,
+                                                     skip_unused=skip_unused)
+        client.query_vendor_license_status_batch(client.licenses,
+                                                 skip_unused=skip_unused)
+        return client
+
     def request(self, command=""):
         """Send a request with a specified command to license manager server
 
@@ -455,15 +653,13 @@ class ManagerClient(_Client):
         return self._request_parse(response)
 
     def _request_pack(self, command=""):
-        data = ( self.user,
-                 self.host,
-                 self.server_params["server_daemon"],
-                 self.tty,
-                 command )
-        req = '\x01\x04' + ''.join([d+'\x00' for d in data])
-        headerstr = self._header_create(req)
-        req = headerstr + req
-        return req
+        data = ( self.user.encode(),
+                 self.host.encode(),
+                 self.server_params["server_daemon"].encode(),
+                 self.tty.encode(),
+                 command.encode() )
+        req = b'\x01\x04' + b'\x00'.join(data) + b'\x00'
+        return self._header_create(req)
 
 
 class VendorClient(_Client):
@@ -478,7 +674,7 @@ class VendorClient(_Client):
     def query_vendor_features(self):
         """Query a vendor daemon for a list of available features"""
         if self.oldproto:
-            msg = self._stub_old('\x3d\xda\x6c\x31')
+            msg = self._stub_old(b'\x3d\xda\x6c\x31')
         else:
             msg = self._stub()
         features = msg["text"][0].split()
@@ -487,16 +683,15 @@ class VendorClient(_Client):
 
     def query_vendor_licenses(self):
         """Query a vendor daemon for full license details"""
-        msg = self._stub(data='\x01\x00\x00\x00\x00', reqtype=TYPE_LICSET)
+        msg = self._stub(data=b'\x01\x00\x00\x00\x00', reqtype=TYPE_LICSET)
         # Sometimes this will have a garbage whitespace entry.
         # Remove those before continuing.
-        msg["text"] = filter(lambda x: not re.match('^\s*$', x), msg["text"])
-        num = len(msg["text"])/8
-        license_sets =[{} for x in range(num)]
+        msg["text"] = [x for x in msg["text"] if x.strip()]
         keys = ["fid", "sig", "names", "date1", "date2", "fid", "url", "license_text"]
-        for i in range(len(msg["text"])):
-            lic = license_sets[i/8]
-            lic[keys[i%8]] = msg["text"][i]
+        # Each license set is 8 consecutive fields; chunk them in C with
+        # zip over a shared iterator rather than div/mod per element
+        it = iter(msg["text"])
+        license_sets = [dict(zip(keys, chunk)) for chunk in zip(*[it]*8)]
         self.license_sets.extend([flexnet.licenses.LicenseSet(lic) for lic in license_sets])
         return license_sets
 
@@ -514,6 +709,13 @@ class VendorClient(_Client):
         else:
             status = self._query_license_status(feature, sign)
 
+        # Most licenses are idle; when nothing is checked out there are no
+        # usage responses to read, so stop here
+        if not status["used"]:
+            status["usage"] = []
+            lic.status.update(status)
+            return status
+
         # Query usage.  Implicitly refers to last license that was checked; no
         # new request is sent.
         status["usage"] = []
@@ -524,11 +726,61 @@ class VendorClient(_Client):
         lic.status.update(status)
         return status
 
+    def query_vendor_license_status_batch(self, lics, window=8, skip_unused=False):
+        """Query status and usage for several licenses with pipelined requests
+
+        Responses carry no request IDs but arrive in request order, so up
+        to `window` status requests are sent in a single write and their
+        responses read back in sequence -- one round-trip per window
+        instead of per license.  The window keeps the amount written ahead
+        of the reads bounded.  With skip_unused, idle licenses get just
+        their counts recorded, with no usage list at all.  The older
+        protocol is queried one at a time as before.
+        """
+        if self.oldproto:
+            for lic in lics:
+                self.query_vendor_license_status(lic)
+            return
+        lics = list(lics)
+        for start in range(0, len(lics), window):
+            batch = lics[start:start+window]
+            reqs = []
+            for lic in batch:
+                sign = lic.sign
+                if not sign:
+                    sign = lic.others[0]
+                reqs.append(self._license_status_pack(lic.feature, sign))
+            self.s.sendall(b''.join(reqs))
+            for lic in batch:
+                msg = self._request_parse(self._query())
+                status = self._license_status_parse(msg)
+                # Nothing checked out means no usage responses follow
+                if not status["used"]:
+                    if not skip_unused:
+                        status["usage"] = []
+                    lic.status.update(status)
+                    continue
+                # The per-checkout usage responses follow each status
+                # response in the stream, exactly as in the serial case
+                status["usage"] = []
+                for i in range(status["used"]):
+                    status["usage"].append(self._query_license_usage())
+                lic.status.update(status)
+
     def _query_license_status(self, feature, sign):
         """Query status on a single license by feature name and signature"""
+        req = self._license_status_pack(feature, sign)
+        response = self._query(req)
+        return self._license_status_parse(self._request_parse(response))
+
+    def _license_status_pack(self, feature, sign):
+        """Build a complete license status request packet"""
+        data = feature.encode() + b'\x00' + sign[:20].encode() + b'\x00'*4 + b'\x01'
+        return self._header_create(data, TYPE_REQLIC)
+
+    def _license_status_parse(self, msg):
+        """Pick the status fields out of a parsed REQLIC1 response"""
         status = {}
-        req = '\x00'.join([feature, sign[:20]]) + '\x00'*4 + '\x01'
-        msg = self._stub(data=req, reqtype=TYPE_REQLIC)
         status["prefix"] = msg["prefix"]
         status["used"] = msg["used"]
         status["total"] = msg["total"]
@@ -538,15 +790,15 @@ class VendorClient(_Client):
     def _query_license_status_old(self, feature, sign):
         """Query status on a single license by feature name and signature (older version)"""
         status = {}
-        req = feature.ljust(31, '\x00') + sign.ljust(21, '\x00') + '1'
-        cb = (sum(map(ord, req))+108)%256
-        req = '\x6c' + chr(cb) + req
-        req = req.ljust(147, '\x00')
+        req = feature.encode().ljust(31, b'\x00') + sign.encode().ljust(21, b'\x00') + b'1'
+        cb = (sum(req)+108)%256
+        req = _BB.pack(0x6c, cb) + req
+        req = req.ljust(147, b'\x00')
         response = self._query(req)
 
         # Cadence... these should probably go on the previous usage entry?
         # ugly, ugly, ugly
-        while ord(response[0]) != 0x4e:
+        while response[0] != 0x4e:
             lics = self.licenses
             response = self._query(req)
             #idx = lics.index(lic)-1
@@ -555,7 +807,7 @@ class VendorClient(_Client):
         msg = self._request_parse(response)
         status["used"] = int(msg["text"][0])
         status["total"] = int(msg["text"][1])
-        status["timestamp"] = time.gmtime(int(msg["text"][2]))
+        status["timestamp"] = _gmtime(int(msg["text"][2]))
         return status
 
     def _query_license_usage(self):
@@ -567,12 +819,12 @@ class VendorClient(_Client):
 
     def _stub_old(self, data):
         """Send a general request to a vendor daemon (older protocol)"""
-        req = data.ljust(147, '\x00')
+        req = data.ljust(147, b'\x00')
         response = self._query(req)
         return self._request_parse(response)
 
-    def _stub(self, data='\x31\x00\x30\x00', reqtype=TYPE_STUB):
+    def _stub(self, data=b'\x31\x00\x30\x00', reqtype=TYPE_STUB):
         """Send a general request to a vendor daemon"""
-        req = self._header_create(data, reqtype) + data
+        req = self._header_create(data, reqtype)
         response = self._query(req)
         return self._request_parse(response)
@@ -1,8 +1,6 @@
 """FlexNet text configuration file."""
 
 import re
-import StringIO
-import shlex
 
 # http://media.3ds.com/support/simulia/public/flexlm108/EndUser/chap10.htm
 
@@ -20,67 +18,96 @@ def flexnet_parse(text):
     entries = _flexnet_parse(lines)
     return entries
 
+# One token per match: a quoted string (quotes kept, as shlex returned
+# them), a run of word characters (shlex's defaults plus the extras the
+# old lexer added), or any other single non-space character such as '='.
+_TOKEN_RE = re.compile(r'"[^"]*"'
+                       r"|'[^']*'"
+                       r'|[\w.,\-/:;+^]+'
+                       r'|\S')
+
 def _flexnet_lex(text):
     text = text.replace('\r\n', '\n')
     text = text.replace('\\\n', '')
     lines = []
     for line in text.split('\n'):
-        line = re.sub(r'\s+', ' ', line)
-        lines.append([])
-        str_file = StringIO.StringIO(line)
-        lex = shlex.shlex(str_file)
-        lex.wordchars += ".,-/:;+^"
-        token = lex.get_token()
-        while token != lex.eof:
-            lines[-1].append(token)
-            token = lex.get_token()
-    lines = filter(len, lines)
+        tokens = []
+        for token in _TOKEN_RE.findall(line):
+            if token.startswith('#'): # comment runs to end of line
+                break
+            tokens.append(token)
+        if tokens:
+            lines.append(tokens)
     return lines
 
 def _flexnet_parse(lines):
     entries = {"servers": [], "vendors": [], "use_server": False, "licenses": [] }
     for line in lines:
-        if line[0] == 'USE_SERVER':
-            entries['use_server'] = True
-        elif line[0] == 'SERVER':
-            server = {}
-            server['host'] = line[1]
-            server['hostid'] = line[2]
-            opts = line[3:]
-            while len(opts) and opts[0] == '=':
-                server['hostid'] += opts.pop(0)
-                server['hostid'] += opts.pop(0)
-            if len(opts):
-                server['port'] = int(opts[0])
-            entries['servers'].append(server)
-        elif line[0] == 'VENDOR' or line[0] == 'DAEMON':
-            vendor = {}
-            vendor['vendor'] = line[1]
-            if len(line)>2:
-                vendor['vendor_daemon_path'] = line[2]
-            entries['vendors'].append(vendor)
-        elif line[0] == 'INCREMENT' or line[0] == 'FEATURE':
-            lic = {}
-            lic['feature']  = line[1]
-            lic['vendor']   = line[2]
-            lic['version']  = line[3]
-            lic['expdate']  = line[4]
-            if line[5] == 'uncounted':
-                lic['quantity'] = 0
-            else: 
-                lic['quantity'] = int(line[5])
-            # NOTE: The parsing gets too easily confused with the extra entries
-            opts = line[6:]
-            while opts.count('=') > 0:
-                i = opts.index('=')
-                val = opts.pop(i+1).strip('"')
-                opts.pop(i)
-                key = opts.pop(i-1).strip('"').lower()
-                while len(opts)>1 and opts[1] == '=':
-                    val += opts.pop(1)
-                    val += opts.pop(1)
-                lic[key] = val
-            if len(opts) > 0:
-                lic['others'] = opts
-            entries['licenses'].append(lic)
+        handler = _LINE_HANDLERS.get(line[0])
+        if handler:
+            handler(entries, line)
     return entries
+
+def _parse_use_server(entries, line):
+    entries['use_server'] = True
+
+def _parse_server(entries, line):
+    server = {}
+    server['host'] = line[1]
+    server['hostid'] = line[2]
+    opts = line[3:]
+    while len(opts) and opts[0] == '=':
+        server['hostid'] += opts.pop(0)
+        server['hostid'] += opts.pop(0)
+    if len(opts):
+        server['port'] = int(opts[0])
+    entries['servers'].append(server)
+
+def _parse_vendor(entries, line):
+    vendor = {}
+    vendor['vendor'] = line[1]
+    if len(line)>2:
+        vendor['vendor_daemon_path'] = line[2]
+    entries['vendors'].append(vendor)
+
+def _parse_license(entries, line):
+    lic = {}
+    lic['feature']  = line[1]
+    lic['vendor']   = line[2]
+    lic['version']  = line[3]
+    lic['expdate']  = line[4]
+    if line[5] == 'uncounted':
+        lic['quantity'] = 0
+    else:
+        lic['quantity'] = int(line[5])
+    # Single forward scan over the option tokens: 'key = value' triples
+    # with any 'val = a=b' continuations merged, and everything else
+    # collected in order as 'others'.
+    others = []
+    i = 6
+    n = len(line)
+    while i < n:
+        if i+2 < n and line[i+1] == '=':
+            key = line[i].strip('"').lower()
+            val = line[i+2].strip('"')
+            i += 3
+            while i+1 < n and line[i] == '=':
+                val += line[i] + line[i+1]
+                i += 2
+            lic[key] = val
+        else:
+            others.append(line[i])
+            i += 1
+    if others:
+        lic['others'] = others
+    entries['licenses'].append(lic)
+
+# Dispatch on the leading keyword; one dict lookup replaces the chain of
+# string comparisons per line.  UPGRADE and PACKAGE lines are recognized
+# in FLEXNET_LINES but not parsed yet.
+_LINE_HANDLERS = {'USE_SERVER': _parse_use_server,
+                  'SERVER':     _parse_server,
+                  'VENDOR':     _parse_vendor,
+                  'DAEMON':     _parse_vendor,
+                  'INCREMENT':  _parse_license,
+                  'FEATURE':    _parse_license}
@@ -3,6 +3,8 @@ import flexnet.file
 class LicenseSet(object):
     """A grouped set of licenses as returned from a vendor daemon."""
 
+    __slots__ = ('fid', 'sig', 'names', 'date1', 'date2', 'url', 'licenses')
+
     def __init__(self, license_set_data):
         self.fid   = license_set_data["fid"]
         self.sig   = license_set_data["sig"]
@@ -31,6 +33,9 @@ class LicenseSet(object):
 class License(object):
     """An individual license."""
 
+    __slots__ = ('feature', 'vendor', 'version', 'expdate', 'quantity',
+                 'notice', 'issued', 'start', 'sign', 'others', 'status')
+
     def __init__(self, license_data):
         # Required
         self.feature  = license_data["feature"]
@@ -60,6 +65,6 @@ class License(object):
         lines.append(fmt % ("start",    self.start))
         lines.append(fmt % ("sign",     self.sign))
         lines.append("status")
-        for key in self.status:
-            lines.append("    " + fmt % (key, self.status[key]))
+        for key, val in self.status.items():
+            lines.append("    " + fmt % (key, val))
         return '\n'.join(lines)
@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+
+from setuptools import setup, Extension
+
+setup(
+    name="flexnet",
+    version="0.1",
+    description="License utility for FlexNet-based license managers",
+    packages=["flexnet"],
+    package_dir={"flexnet": "."},
+    # Optional native CRC/check byte helper; flexnet.client falls back to
+    # a pure-Python implementation if this isn't built.
+    ext_modules=[Extension("flexnet._crc", ["_crc.c"])],
+)